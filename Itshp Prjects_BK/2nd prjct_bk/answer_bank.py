@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from types import MappingProxyType
+
+# Precomputed answers written by warm_answers.py and loaded read-only by bot.py
+ANSWER_BANK_PATH = os.path.join(os.path.dirname(__file__), '..', 'answer_bank.json')
+
+# Path to FAQ data CSV (the bank is only valid for the FAQ version it was built from)
+FAQ_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'faq_data_all1.csv')
+
+
+def normalize_question(text):
+    """Normalize a question for lookup so case, punctuation and spacing don't matter."""
+    text = unicodedata.normalize('NFKC', str(text)).casefold()
+    return ' '.join(re.sub(r"[^\w\s]", ' ', text).split())
+
+
+def faq_version(faq_path=FAQ_CSV_PATH):
+    """Hash of the FAQ file, stored in the bank so a new FAQ invalidates old answers."""
+    with open(faq_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _freeze(answers):
+    return MappingProxyType({
+        language: MappingProxyType(dict(entries)) for language, entries in (answers or {}).items()
+    })
+
+
+def _lookup(section, key, language):
+    if language:
+        return section.get(language, {}).get(key)
+    for entries in section.values():
+        if key in entries:
+            return entries[key]
+    return None
+
+
+class AnswerBank:
+    """Read-only lookup tables of answers keyed by language and normalized question.
+
+    FAQ answers (FAQ rows and questions the FAQ matcher mapped to one) are kept apart
+    from general answers (Gemini web-search fallbacks), because the FAQ flow must only
+    ever serve the former.
+    """
+
+    def __init__(self, faq=None, general=None, version=None):
+        self.version = version
+        self._faq = _freeze(faq)
+        self._general = _freeze(general)
+
+    def __len__(self):
+        return sum(len(entries) for section in (self._faq, self._general) for entries in section.values())
+
+    def get_faq(self, question, language=None):
+        """Return the stored FAQ answer, or None. Without a language every partition is checked."""
+        return _lookup(self._faq, normalize_question(question), language)
+
+    def get(self, question, language=None):
+        """Return a stored FAQ or general answer, or None (FAQ answers win)."""
+        key = normalize_question(question)
+        answer = _lookup(self._faq, key, language)
+        return answer if answer is not None else _lookup(self._general, key, language)
+
+    def save(self, path=ANSWER_BANK_PATH):
+        """Write the bank atomically so a running bot never reads a half-written file."""
+        data = {'faq_version': self.version,
+                'faq': {language: dict(entries) for language, entries in self._faq.items()},
+                'general': {language: dict(entries) for language, entries in self._general.items()}}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=ANSWER_BANK_PATH, faq_path=FAQ_CSV_PATH):
+        """Load the bank. Missing, unreadable or stale (older FAQ version) banks load empty."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+
+        version = faq_version(faq_path)
+        if data.get('faq_version') != version:
+            print("Answer bank was built from a different FAQ version, ignoring it. Re-run warm_answers.py.")
+            return cls(version=version)
+        return cls(data.get('faq'), data.get('general'), version)
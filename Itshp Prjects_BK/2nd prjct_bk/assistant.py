@@ -0,0 +1,167 @@
+"""Gemini calls for the BK chatbot: web-search answers and FAQ matching.
+
+Importing this module has no side effects; the genai client is created on first use,
+so batch jobs and tests can swap in a stub with set_client() without an API key.
+"""
+import os
+import re
+import time
+import pandas as pd
+
+try:
+    from google import genai
+    from google.genai import types
+except ImportError:  # only needed for real API calls; a stub client works without it
+    genai = types = None
+
+# Path to FAQ data CSV
+FAQ_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'faq_data_all1.csv')
+
+# System prompt — Gemini finds BK info by itself via Google Search
+BK_SYSTEM_PROMPT = """You are a helpful and professional Bank of Kigali (BK) customer service chatbot.
+Use Google Search to find accurate, up-to-date information from bk.rw and other reliable sources.
+Always cite your sources when you use web results.
+Be polite, professional, and concise (2-5 sentences unless more detail is needed).
+If the question is completely unrelated to banking or BK, politely redirect the user."""
+
+# Used only when lang_detect couldn't tell which language the user writes in
+AUTO_LANGUAGE_INSTRUCTION = "Respond in the same language the user writes in (English, French, or Kinyarwanda)."
+
+RATE_LIMIT_REPLY = "You've hit the API rate limit. Please wait a moment and try again, or type 'menu'."
+
+
+def load_faq():
+    """Load FAQ data from CSV."""
+    return pd.read_csv(FAQ_CSV_PATH, encoding='utf-8-sig')
+
+
+_client = None
+
+
+def get_client():
+    """Return the genai client, creating it from GOOGLE_API_KEY on first use."""
+    global _client
+    if _client is None:
+        if genai is None:
+            raise RuntimeError("google-genai is not installed (pip install google-genai); "
+                               "use set_client() to run without it.")
+        _client = genai.Client(api_key=os.getenv('GOOGLE_API_KEY'))
+    return _client
+
+
+def set_client(client):
+    """Use another client (e.g. an offline stub) for all Gemini calls."""
+    global _client
+    _client = client
+
+
+def search_config():
+    """Google Search grounding for web answers (None when google-genai isn't installed)."""
+    if types is None:
+        return None
+    return types.GenerateContentConfig(tools=[types.Tool(google_search=types.GoogleSearch())])
+
+
+def ask_gemini_about_bk(user_question, conversation_history="", language=None):
+    """Ask Gemini a question about Bank of Kigali — it searches the web itself for accurate answers."""
+    language_instruction = f"Respond in {language}." if language else AUTO_LANGUAGE_INSTRUCTION
+    prompt = f"""{BK_SYSTEM_PROMPT}
+{language_instruction}
+
+CONVERSATION SO FAR:
+{conversation_history}
+
+USER QUESTION: {user_question}
+
+Respond helpfully and accurately."""
+
+    # Outside the retry loop: a missing or misconfigured client is not an API error
+    client = get_client()
+
+    # Retry up to 3 times in case of rate limiting
+    for attempt in range(3):
+        try:
+            response = client.models.generate_content(
+                model="gemini-2.5-flash",
+                contents=prompt,
+                config=search_config()
+            )
+            return response.text.strip()
+        except Exception as e:
+            error_msg = str(e)
+            print(f"Gemini error (attempt {attempt + 1}/3): {error_msg}")
+            if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
+                time.sleep(3 * (attempt + 1))
+                continue
+            else:
+                return f"Error: {error_msg}\n\nType 'menu' to go back."
+    
+    return RATE_LIMIT_REPLY
+
+
+def match_faq(user_complaint, language, raise_errors=False):
+    """Use Gemini to match a user complaint to the closest FAQ entry and return the answer.
+
+    Returns None when no FAQ matches. API errors also return None, unless raise_errors is
+    set (batch jobs must not mistake a failed call for "no match").
+    """
+    faq_df = load_faq()
+    filtered = faq_df[faq_df['Language'].str.strip().str.lower() == language.lower()]
+
+    if filtered.empty:
+        return None
+
+    # Build a numbered list of FAQ questions for Gemini to choose from
+    faq_list = ""
+    for idx, row in filtered.iterrows():
+        faq_list += f"[{idx}] Category: {row['Category']} | Q: {row['Question']}\n"
+
+    prompt = f"""You are a Bank of Kigali FAQ matching assistant.
+A customer has a complaint or question. Match it to the most relevant FAQ below.
+
+CUSTOMER MESSAGE ({language}): "{user_complaint}"
+
+AVAILABLE FAQs:
+{faq_list}
+
+RULES:
+- If one of the FAQs clearly matches the customer's intent, reply with ONLY the index number in brackets, e.g. [5]
+- If NO FAQ is relevant, reply with exactly: NO_MATCH
+- Do NOT add any other text."""
+
+    client = get_client()
+    for attempt in range(3):
+        try:
+            response = client.models.generate_content(
+                model="gemini-2.5-flash",
+                contents=prompt
+            )
+            result = response.text.strip()
+
+            if "NO_MATCH" in result:
+                return None
+
+            # Extract the index from the response like [5]
+            match = re.search(r'\[(\d+)\]', result)
+            if match:
+                matched_idx = int(match.group(1))
+                if matched_idx in filtered.index:
+                    row = faq_df.loc[matched_idx]
+                    return f"{row['Category']}\n\n{row['Answer']}"
+
+            return None
+
+        except Exception as e:
+            error_msg = str(e)
+            print(f"FAQ match error (attempt {attempt + 1}/3): {error_msg}")
+            if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
+                time.sleep(3 * (attempt + 1))
+                continue
+            elif raise_errors:
+                raise
+            else:
+                return None
+
+    if raise_errors:
+        raise RuntimeError(RATE_LIMIT_REPLY)
+    return None
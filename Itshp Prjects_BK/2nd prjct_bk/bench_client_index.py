@@ -0,0 +1,128 @@
+"""Benchmark: RSS and lookup latency of the DataFrame check in bot.py vs ClientIndex.
+
+Usage: python bench_client_index.py [number of clients]   (default 10,000,000)
+
+Each approach runs in a fresh process so the RSS numbers don't leak into each other.
+"""
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from client_index import ClientIndex
+
+# The DataFrame scan is O(n) per check, so it gets far fewer lookups than the index
+DATAFRAME_LOOKUPS = 5
+INDEX_LOOKUPS = 100_000
+
+
+def rss_mb():
+    """Return (total RSS, private RSS) in MB.
+
+    Private RSS (RssAnon) excludes mmap'd file pages, which the OS shares between
+    every worker process. Falls back to peak RSS for both outside Linux.
+    """
+    stats = {}
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('VmRSS', 'RssAnon'):
+                    stats[key] = int(value.split()[0]) / 1024
+        return np.array([stats['VmRSS'], stats['RssAnon']])
+    except (OSError, KeyError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return np.array([peak, peak])
+
+
+def make_clients(n, seed=0):
+    """Generate n synthetic clients with the same columns and formats as Clients.csv."""
+    rng = np.random.default_rng(seed)
+    ids = pd.Series(np.arange(n)).astype(str)
+    account = rng.choice(10**9, size=n, replace=False) if n < 10**9 else np.arange(n)
+    account = pd.Series(account).astype(str).str.zfill(9)
+    month = rng.integers(1, 13, n)
+    day = rng.integers(1, 29, n)
+    year = rng.integers(1940, 2008, n)
+    return pd.DataFrame({
+        'Name': 'Client' + ids,
+        'Account number': '040-' + account.str[:7] + '-' + account.str[7:],
+        'Date of birth': (pd.Series(month).astype(str).str.zfill(2) + '-' +
+                          pd.Series(day).astype(str).str.zfill(2) + '-' +
+                          pd.Series(year).astype(str)),
+        'Phone number': (250_700_000_000 + rng.integers(0, 10**8, n)).astype(str),
+        'PIN': rng.integers(1000, 10000, n).astype(str),
+        'OTP': rng.integers(10000, 100000, n).astype(str),
+        'Email': 'client' + ids + '@gmail.com',
+    })
+
+
+def bench_dataframe(csv_path, queries, out):
+    """Same load and filter expression as the identity_verify step in bot.py."""
+    base = rss_mb()
+    df = pd.read_csv(csv_path, encoding='utf-8-sig')
+    loaded = rss_mb()
+
+    start = time.perf_counter()
+    for name, account, dob, phone in queries[:DATAFRAME_LOOKUPS]:
+        user_row = df[
+            (df['Name'].astype(str).str.strip().str.lower() == name.strip().lower()) &
+            (df['Account number'].astype(str).str.strip() == account) &
+            (df['Date of birth'].astype(str).str.strip().str.replace('/', '-').str.lstrip('0').str.replace('-0', '-') ==
+             dob.replace('/', '-').lstrip('0').replace('-0', '-')) &
+            (df['Phone number'].astype(str).str.strip() == phone)
+        ]
+        assert not user_row.empty
+    elapsed = time.perf_counter() - start
+    out.put(('DataFrame', *(loaded - base), elapsed / DATAFRAME_LOOKUPS))
+
+
+def bench_index(index_path, queries, out):
+    base = rss_mb()
+    index = ClientIndex.load(index_path, mmap=True)
+
+    start = time.perf_counter()
+    for i in range(INDEX_LOOKUPS):
+        assert index.verify(*queries[i % len(queries)]) is not None
+    elapsed = time.perf_counter() - start
+    out.put(('ClientIndex (mmap)', *(rss_mb() - base), elapsed / INDEX_LOOKUPS))
+
+
+def run(target, *args):
+    ctx = mp.get_context('spawn')
+    out = ctx.Queue()
+    proc = ctx.Process(target=target, args=args + (out,))
+    proc.start()
+    result = out.get()
+    proc.join()
+    return result
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'Clients.csv')
+        index_path = os.path.join(tmp, 'Clients.idx')
+
+        print(f"Generating {n:,} clients...")
+        df = make_clients(n)
+        df.to_csv(csv_path, index=False)
+        sample = df.sample(min(n, 1000), random_state=1)
+        queries = list(sample[['Name', 'Account number', 'Date of birth', 'Phone number']]
+                       .itertuples(index=False, name=None))
+        del df, sample
+
+        start = time.perf_counter()
+        index = ClientIndex.from_csv(csv_path)
+        index.save(index_path)
+        print(f"Built index in {time.perf_counter() - start:.1f}s ({index.nbytes / 2**20:.1f} MB on disk)")
+        del index
+
+        print(f"\n{'Approach':<20} {'RSS (MB)':>10} {'Private (MB)':>14} {'Lookup (us)':>14}")
+        for label, rss, private, latency in (run(bench_dataframe, csv_path, queries),
+                                             run(bench_index, index_path, queries)):
+            print(f"{label:<20} {rss:>10.1f} {private:>14.1f} {latency * 1e6:>14.1f}")
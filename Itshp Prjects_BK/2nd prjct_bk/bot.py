@@ -1,14 +1,19 @@
-from flask import Flask, render_template, request, session, jsonify
+from flask import Flask, render_template, request, session, jsonify, Response, stream_with_context
 import pandas as pd
+import hmac
 import random
-import re
 import time
-from google import genai
-from google.genai import types
+import uuid
 import os
 from dotenv import load_dotenv
 import smtplib
 from email.message import EmailMessage
+from event_log import EventLog
+from answer_bank import AnswerBank
+from lang_detect import detect_language
+from identity import find_client
+from bulk_verify import load_client_keys, parse_ndjson, to_ndjson, verify_records
+from assistant import ask_gemini_about_bk, get_client, match_faq
 
 # Load environment variables from .env file
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
@@ -16,30 +21,31 @@ load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
 app = Flask(__name__, template_folder='templates', static_folder='static')
 app.secret_key = os.getenv('FLASK_SECRET_KEY')
 
-# Create Google genai client
-client = genai.Client(api_key=os.getenv('GOOGLE_API_KEY'))
-
 # Path to client data CSV
 CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Clients.csv')
 
-# Path to FAQ data CSV
-FAQ_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'faq_data_all1.csv')
+# Precomputed answers from warm_answers.py (read-only, loaded once at startup)
+answer_bank = AnswerBank.load()
+
+# Conversation event log (step transitions and latencies only — no PII or PINs)
+event_log = EventLog()
 
 def load_clients():
     """Reload CSV each time so changes are picked up without restarting the server."""
     return pd.read_csv(CSV_PATH, encoding='utf-8-sig')
 
-def load_faq():
-    """Load FAQ data from CSV."""
-    return pd.read_csv(FAQ_CSV_PATH, encoding='utf-8-sig')
+# Typed language choices (menu numbers or names)
+LANGUAGE_CHOICES = {
+    '1': 'English', '1.': 'English', 'english': 'English', 'en': 'English',
+    '2': 'French', '2.': 'French', 'french': 'French', 'fr': 'French', 'français': 'French',
+    '3': 'Kinyarwanda', '3.': 'Kinyarwanda', 'kinyarwanda': 'Kinyarwanda', 'kiny': 'Kinyarwanda', 'rw': 'Kinyarwanda',
+}
 
-# System prompt — Gemini finds BK info by itself via Google Search
-BK_SYSTEM_PROMPT = """You are a helpful and professional Bank of Kigali (BK) customer service chatbot.
-Use Google Search to find accurate, up-to-date information from bk.rw and other reliable sources.
-Always cite your sources when you use web results.
-Be polite, professional, and concise (2-5 sentences unless more detail is needed).
-If the question is completely unrelated to banking or BK, politely redirect the user.
-Respond in the same language the user writes in (English, French, or Kinyarwanda)."""
+FAQ_PROMPTS = {
+    'English': "Great! Please describe your complaint or question and I'll find an answer for you.",
+    'French': "Très bien! Veuillez décrire votre plainte ou question et je trouverai une réponse pour vous.",
+    'Kinyarwanda': "Byiza! Nyamuneka sobanura ikibazo cyawe kandi nzakushakira igisubizo.",
+}
 
 
 def send_otp_email(receiver_email, otp_code):
@@ -61,97 +67,46 @@ def send_otp_email(receiver_email, otp_code):
         return False
 
 
-def ask_gemini_about_bk(user_question, conversation_history=""):
-    """Ask Gemini a question about Bank of Kigali — it searches the web itself for accurate answers."""
-    prompt = f"""{BK_SYSTEM_PROMPT}
-
-CONVERSATION SO FAR:
-{conversation_history}
-
-USER QUESTION: {user_question}
-
-Respond helpfully and accurately."""
-
-    # Retry up to 3 times in case of rate limiting
-    for attempt in range(3):
-        try:
-            response = client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    tools=[types.Tool(google_search=types.GoogleSearch())]
-                )
-            )
-            return response.text.strip()
-        except Exception as e:
-            error_msg = str(e)
-            print(f"Gemini error (attempt {attempt + 1}/3): {error_msg}")
-            if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
-                time.sleep(3 * (attempt + 1))
-                continue
-            else:
-                return f"Error: {error_msg}\n\nType 'menu' to go back."
-    
-    return "You've hit the API rate limit. Please wait a moment and try again, or type 'menu'."
-
-
-def match_faq(user_complaint, language):
-    """Use Gemini to match a user complaint to the closest FAQ entry and return the answer."""
-    faq_df = load_faq()
-    filtered = faq_df[faq_df['Language'].str.strip().str.lower() == language.lower()]
-
-    if filtered.empty:
-        return None
-
-    # Build a numbered list of FAQ questions for Gemini to choose from
-    faq_list = ""
-    for idx, row in filtered.iterrows():
-        faq_list += f"[{idx}] Category: {row['Category']} | Q: {row['Question']}\n"
-
-    prompt = f"""You are a Bank of Kigali FAQ matching assistant.
-A customer has a complaint or question. Match it to the most relevant FAQ below.
-
-CUSTOMER MESSAGE ({language}): "{user_complaint}"
-
-AVAILABLE FAQs:
-{faq_list}
-
-RULES:
-- If one of the FAQs clearly matches the customer's intent, reply with ONLY the index number in brackets, e.g. [5]
-- If NO FAQ is relevant, reply with exactly: NO_MATCH
-- Do NOT add any other text."""
-
-    for attempt in range(3):
-        try:
-            response = client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=prompt
-            )
-            result = response.text.strip()
-
-            if "NO_MATCH" in result:
-                return None
-
-            # Extract the index from the response like [5]
-            match = re.search(r'\[(\d+)\]', result)
-            if match:
-                matched_idx = int(match.group(1))
-                if matched_idx in filtered.index:
-                    row = faq_df.loc[matched_idx]
-                    return f"{row['Category']}\n\n{row['Answer']}"
-
-            return None
-
-        except Exception as e:
-            error_msg = str(e)
-            print(f"FAQ match error (attempt {attempt + 1}/3): {error_msg}")
-            if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
-                time.sleep(3 * (attempt + 1))
-                continue
-            else:
-                return None
 
-    return None
+def timed(stages, name, func, *args):
+    """Call func(*args) and record how long it took (ms) under stages[name]."""
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        stages[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
+def session_language():
+    """The language remembered for this session (sessions from before auto-detection used 'faq_language')."""
+    return session.get('language') or session.get('faq_language')
+
+
+def answer_general_query(user_input, conversation_history, stages):
+    """Answer from the answer bank if we can, otherwise ask Gemini. Returns (reply, cache_hit)."""
+    # Detected language routes to the right bank partition and Gemini prompt; remembered per session
+    language = detect_language(user_input, default=session_language())
+    if language:
+        session['language'] = language
+
+    cached = answer_bank.get(user_input, language)
+    if cached:
+        return cached, True
+    return timed(stages, 'gemini', ask_gemini_about_bk, user_input, conversation_history, language), False
+
+
+def log_turn(step_from, intent, stages, started, cache_hit=False, error=False):
+    """Record one /chat turn in the event log."""
+    stages['total'] = round((time.perf_counter() - started) * 1000, 1)
+    event_log.emit({
+        'sid': session.get('sid'),
+        'step_from': step_from,
+        'step_to': session.get('step'),
+        'intent': intent,
+        'latency_ms': stages,
+        'cache_hit': cache_hit,
+        'error': error,
+    })
 
 
 def get_menu_text():
@@ -196,6 +151,7 @@ def detect_intent(user_input):
 @app.route('/')
 def home():
     session.clear()
+    session['sid'] = uuid.uuid4().hex
     welcome = "Hi! Welcome to Bank of Kigali Chatbot!"
     menu = get_menu_text()
     session['messages'] = [
@@ -208,6 +164,13 @@ def home():
 
 @app.route('/chat', methods=['POST'])
 def chat():
+    started = time.perf_counter()
+    stages = {}
+    intent = None
+    cache_hit = False
+    error = False
+    session.setdefault('sid', uuid.uuid4().hex)
+
     user_input = request.json.get('message', '').strip()
     messages = session.get('messages', [])
     step = session.get('step', 'menu')
@@ -230,6 +193,7 @@ def chat():
         messages.append({"text": get_menu_text(), "sender": "bot"})
         session['step'] = 'menu'
         session['messages'] = messages
+        log_turn(step, 'menu', stages, started)
         return jsonify({'messages': messages, 'step': session['step']})
 
     # Get session data for PIN reset flow
@@ -251,17 +215,18 @@ def chat():
                 session['step'] = 'identity_verify'
 
             elif intent == 'contact':
-                messages.append({
-                    "text": (
-                        "I'd be happy to help! First, please choose your preferred language:\n\n"
-                        "1️⃣  English\n"
-                        "2️⃣  French\n"
-                        "3️⃣  Kinyarwanda\n\n"
-                        "Type the number or the language name."
-                    ),
-                    "sender": "bot"
-                })
-                session['step'] = 'faq_language'
+                # No language menu: the language is detected from what the user writes
+                language = detect_language(user_input, default=session_language())
+                if language:
+                    session['language'] = language
+                    text = FAQ_PROMPTS[language]
+                else:
+                    text = (
+                        "I'd be happy to help! Please describe your complaint or question "
+                        "in English, French or Kinyarwanda and I'll find an answer for you."
+                    )
+                messages.append({"text": text, "sender": "bot"})
+                session['step'] = 'faq_complaint'
 
             elif intent == 'general_query':
                 # If user just typed "2", ask what they want to know
@@ -272,7 +237,7 @@ def chat():
                     })
                 else:
                     # Use Gemini + Google Search to answer
-                    reply = ask_gemini_about_bk(user_input, conversation_history)
+                    reply, cache_hit = answer_general_query(user_input, conversation_history, stages)
                     reply += "\n\nType 'menu' to see options or keep asking questions!"
                     messages.append({"text": reply, "sender": "bot"})
                 session['step'] = 'general_query'
@@ -296,29 +261,18 @@ def chat():
                 session['step'] = 'menu'
             else:
                 # Continue answering BK questions
-                reply = ask_gemini_about_bk(user_input, conversation_history)
+                reply, cache_hit = answer_general_query(user_input, conversation_history, stages)
                 reply += "\n\n Type 'menu' to see options or keep asking questions!"
                 messages.append({"text": reply, "sender": "bot"})
                 session['step'] = 'general_query'
 
-        # ─── FAQ: LANGUAGE SELECTION ──────────────────────────
+        # ─── FAQ: LANGUAGE SELECTION (sessions started before auto-detection) ──
         elif step == 'faq_language':
-            lower = user_input.lower().strip()
-            lang_map = {
-                '1': 'English', '1.': 'English', 'english': 'English', 'en': 'English',
-                '2': 'French', '2.': 'French', 'french': 'French', 'fr': 'French', 'français': 'French',
-                '3': 'Kinyarwanda', '3.': 'Kinyarwanda', 'kinyarwanda': 'Kinyarwanda', 'kiny': 'Kinyarwanda', 'rw': 'Kinyarwanda',
-            }
-            chosen_lang = lang_map.get(lower)
+            chosen_lang = LANGUAGE_CHOICES.get(user_input.lower().strip())
 
             if chosen_lang:
-                session['faq_language'] = chosen_lang
-                prompts = {
-                    'English': "Great! Please describe your complaint or question and I'll find an answer for you.",
-                    'French': "Très bien! Veuillez décrire votre plainte ou question et je trouverai une réponse pour vous.",
-                    'Kinyarwanda': "Byiza! Nyamuneka sobanura ikibazo cyawe kandi nzakushakira igisubizo.",
-                }
-                messages.append({"text": prompts[chosen_lang], "sender": "bot"})
+                session['language'] = chosen_lang
+                messages.append({"text": FAQ_PROMPTS[chosen_lang], "sender": "bot"})
                 session['step'] = 'faq_complaint'
             else:
                 messages.append({
@@ -329,12 +283,23 @@ def chat():
         # ─── FAQ: COMPLAINT MATCHING ──────────────────────────
         elif step == 'faq_complaint':
             intent = detect_intent(user_input)
+            chosen_lang = LANGUAGE_CHOICES.get(user_input.lower().strip())
             if intent == 'menu':
                 messages.append({"text": get_menu_text(), "sender": "bot"})
                 session['step'] = 'menu'
+            elif chosen_lang and not user_input.strip()[0].isdigit():
+                # The user typed a language name: switch to it
+                session['language'] = chosen_lang
+                messages.append({"text": FAQ_PROMPTS[chosen_lang], "sender": "bot"})
             else:
-                language = session.get('faq_language', 'English')
-                answer = match_faq(user_input, language)
+                language = detect_language(user_input, default=session_language() or 'English')
+                session['language'] = language
+                # Only FAQ answers here — general (web-search) answers belong to the Q&A mode
+                answer = answer_bank.get_faq(user_input, language)
+                if answer:
+                    cache_hit = True
+                else:
+                    answer = timed(stages, 'faq_match', match_faq, user_input, language)
 
                 if answer:
                     answer += "\n\nAsk another question or type 'menu' to go back."
@@ -402,19 +367,10 @@ def chat():
                 session['phone'] = user_input
 
                 # Verify all details against CSV (reloads CSV each time)
-                df = load_clients()
-                name_input = session['name'].strip().lower()
-                account_number = session['account'].strip()
-                dte_birth = session['dob'].strip()
-                phone_number = session['phone'].strip()
-
-                user_row = df[
-                    (df['Name'].astype(str).str.strip().str.lower() == name_input) &
-                    (df['Account number'].astype(str).str.strip() == account_number) &
-                    (df['Date of birth'].astype(str).str.strip().str.replace('/', '-').str.lstrip('0').str.replace('-0', '-') ==
-                     dte_birth.replace('/', '-').lstrip('0').replace('-0', '-')) &
-                    (df['Phone number'].astype(str).str.strip() == phone_number)
-                ]
+                verify_start = time.perf_counter()
+                user_row = find_client(load_clients(), session['name'], session['account'],
+                                       session['dob'], session['phone'])
+                stages['verify'] = round((time.perf_counter() - verify_start) * 1000, 1)
 
                 if not user_row.empty:
                     user_name = user_row['Name'].values[0]
@@ -564,14 +520,46 @@ def chat():
 
     except Exception as e:
         print(f"Error: {e}")
+        error = True
         messages.append({
             "text": "Sorry, I encountered an error. Please try again or type 'menu'.",
             "sender": "bot"
         })
 
     session['messages'] = messages
+    log_turn(step, intent, stages, started, cache_hit=cache_hit, error=error)
     return jsonify({'messages': messages, 'step': session['step']})
 
 
+@app.route('/verify/batch', methods=['POST'])
+def verify_batch():
+    """Bulk identity verification. Body: JSON array or NDJSON of {id, name, account, dob, phone}."""
+    # Disabled unless an API key is configured — this must never be open to chat users
+    api_key = os.getenv('VERIFY_API_KEY', '')
+    given_key = request.headers.get('X-API-Key', '')
+    if not api_key or not hmac.compare_digest(given_key.encode('utf-8'), api_key.encode('utf-8')):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    # Load the client keys before streaming, so a missing or broken CSV is a 500, not a cut-off 200
+    try:
+        client_keys = load_client_keys()
+    except Exception as e:
+        print(f"Error loading client data: {e}")
+        return jsonify({'error': 'Client data is unavailable.'}), 500
+
+    if request.mimetype == 'application/json':
+        records = request.get_json(silent=True)
+        if not isinstance(records, list):
+            return jsonify({'error': 'Expected a JSON array of records.'}), 400
+        records = (r if isinstance(r, dict) else {} for r in records)
+    else:
+        records = parse_ndjson(request.stream)
+
+    results = to_ndjson(verify_records(records, client_keys))
+    return Response(stream_with_context(results), mimetype='application/x-ndjson')
+
+
 if __name__ == '__main__':
+    # Fail at startup, not on the first question, if the Gemini client can't be created
+    get_client()
     app.run(debug=True)
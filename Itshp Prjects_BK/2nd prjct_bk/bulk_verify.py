@@ -0,0 +1,156 @@
+"""Bulk identity verification for call-centre tools and nightly reconciliation jobs.
+
+Records are dicts with 'name', 'account', 'dob' and 'phone' (plus an optional 'id').
+They are normalized in chunks, vectorized, exactly like the identity_verify step in
+bot.py, and matched with one hash lookup per chunk against the client keys. Results
+are {"index": <position in the input>, "id": <echoed if given>, "verified": true/false}
+— no client data is returned.
+
+Usage:
+    python bulk_verify.py records.ndjson > results.ndjson
+    python bulk_verify.py --bench 1000000
+"""
+import json
+import os
+import sys
+import time
+import pandas as pd
+from identity import normalize_dob
+
+# Path to client data CSV (same file bot.py verifies against)
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Clients.csv')
+
+FIELDS = ('name', 'account', 'dob', 'phone')
+
+# Records are verified this many at a time when streaming
+CHUNK_SIZE = 10_000
+
+# Joins the normalized fields into one key; can't appear in typed input
+_SEP = '\x1f'
+
+
+def build_keys(name, account, dob, phone):
+    """Turn four string Series into one Series of match keys (same rules as identity_verify)."""
+    return (name.astype(str).str.strip().str.lower() + _SEP +
+            account.astype(str).str.strip() + _SEP +
+            normalize_dob(dob) + _SEP +
+            phone.astype(str).str.strip())
+
+
+_client_keys = None
+_client_source = None
+
+
+def load_client_keys(csv_path=CSV_PATH):
+    """Hash index of every client's match key, rebuilt only when the CSV changes on disk."""
+    global _client_keys, _client_source
+    source = (os.path.abspath(csv_path), os.path.getmtime(csv_path))
+    if _client_keys is None or source != _client_source:
+        df = pd.read_csv(csv_path, encoding='utf-8-sig', dtype=str)
+        # A row with a blank key field could only match a query with that field blank too
+        columns = ['Name', 'Account number', 'Date of birth', 'Phone number']
+        df = df[(df[columns].fillna('').apply(lambda column: column.str.strip()) != '').all(axis=1)]
+        keys = build_keys(df['Name'], df['Account number'], df['Date of birth'], df['Phone number'])
+        _client_keys = pd.Index(keys.unique())
+        _client_source = source
+    return _client_keys
+
+
+def verify_frame(records, client_keys=None):
+    """Verify a DataFrame of records. Returns a boolean array, one entry per row."""
+    if client_keys is None:
+        client_keys = load_client_keys()
+    keys = build_keys(*(records[field] for field in FIELDS))
+    # get_indexer probes the Index's hash table: a hash join without materializing the join
+    return client_keys.get_indexer(keys) >= 0
+
+
+def verify_records(records, client_keys=None):
+    """Verify an iterable of record dicts and yield one result dict per record, in order."""
+    if client_keys is None:
+        client_keys = load_client_keys()
+
+    chunk = []
+    position = 0
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= CHUNK_SIZE:
+            yield from _verify_chunk(chunk, position, client_keys)
+            position += len(chunk)
+            chunk = []
+    if chunk:
+        yield from _verify_chunk(chunk, position, client_keys)
+
+
+def _verify_chunk(chunk, position, client_keys):
+    # Object columns, so one record's values (e.g. a null phone) can't change another's dtype
+    df = pd.DataFrame({field: [record.get(field) for record in chunk] for field in FIELDS}, dtype=object)
+    values = df.fillna('').astype(str)
+    # Absent, null and blank fields are all missing: an identity check never passes on them
+    missing = (values.apply(lambda column: column.str.strip()) == '').any(axis=1).to_numpy()
+    verified = verify_frame(values, client_keys) & ~missing
+
+    for i, (record, ok, incomplete) in enumerate(zip(chunk, verified.tolist(), missing.tolist())):
+        # The position goes in its own field so it can never be confused with a caller's id
+        result = {'index': position + i}
+        if 'id' in record:
+            result['id'] = record['id']
+        result['verified'] = ok
+        if incomplete:
+            result['error'] = 'missing fields'
+        yield result
+
+
+def parse_ndjson(lines):
+    """Yield a dict per NDJSON line. Unparseable lines become {} (reported as missing fields)."""
+    for line in lines:
+        try:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            if not line.strip():
+                continue
+            record = json.loads(line)
+        except ValueError:  # includes UnicodeDecodeError
+            record = {}
+        yield record if isinstance(record, dict) else {}
+
+
+def to_ndjson(results):
+    for result in results:
+        yield json.dumps(result, separators=(',', ':')) + '\n'
+
+
+def benchmark(n, chunk_size=100_000):
+    """Verify n synthetic records (half real clients, half wrong) and print records/s."""
+    clients = pd.read_csv(CSV_PATH, encoding='utf-8-sig', dtype=str)
+    real = pd.DataFrame({
+        'name': clients['Name'], 'account': clients['Account number'],
+        'dob': clients['Date of birth'], 'phone': clients['Phone number'],
+    })
+    fake = real.assign(phone=real['phone'] + '0')
+    sample = pd.concat([real, fake], ignore_index=True)
+    records = sample.sample(n, replace=True, random_state=0, ignore_index=True)
+
+    client_keys = load_client_keys()
+    start = time.perf_counter()
+    verified = 0
+    for offset in range(0, n, chunk_size):
+        verified += int(verify_frame(records.iloc[offset:offset + chunk_size], client_keys).sum())
+    elapsed = time.perf_counter() - start
+    print(f"DataFrame API: {n:,} records in {elapsed:.2f}s = {n / elapsed:,.0f} verifications/s ({verified:,} verified)")
+
+    dicts = records.to_dict('records')
+    start = time.perf_counter()
+    for _ in verify_records(dicts, client_keys):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"Record stream: {n:,} records in {elapsed:.2f}s = {n / elapsed:,.0f} verifications/s")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--bench':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
+    else:
+        source = open(sys.argv[1], encoding='utf-8') if len(sys.argv) > 1 else sys.stdin
+        with source:
+            sys.stdout.writelines(to_ndjson(verify_records(parse_ndjson(source))))
@@ -0,0 +1,237 @@
+import os
+import re
+import sys
+from datetime import date
+import numpy as np
+import pandas as pd
+from identity import normalize_dob
+
+# Path to client data CSV (same file bot.py verifies against)
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Clients.csv')
+
+# Prebuilt index files live next to the CSV: Clients.idx.{accounts,records,strings}.npy
+INDEX_PATH = os.path.join(os.path.dirname(__file__), '..', 'Clients.idx')
+
+# Account numbers are compared as exact strings (like identity_verify), stored fixed-width
+ACCOUNT_WIDTH = 20
+
+# One fixed-width record per client (24 bytes instead of several Python objects). The account
+# number isn't repeated here: it lives in the sorted accounts array, at the same position.
+RECORD_DTYPE = np.dtype([
+    ('phone', '<i8'),       # phone digits, e.g. 250793229902 (only canonical digit strings are indexed)
+    ('dob', '<i4'),         # date of birth as a proleptic Gregorian ordinal
+    ('name_off', '<u4'),    # offset of the name in the shared string buffer
+    ('name_len', '<u2'),
+    ('email_off', '<u4'),   # offset of the email in the shared string buffer (length 0 = no email)
+    ('email_len', '<u2'),
+])
+
+# Phones are int64 keys, so only strings that round-trip exactly through int() are valid
+_PHONE_RE = re.compile(r'0|[1-9]\d{0,17}')
+
+# The identity_verify DOB normalization turns MM-DD-YYYY into M-D-YYYY; only that shape is indexed
+_DOB_RE = re.compile(r'([1-9]\d?)-([1-9]\d?)-(\d{4})')
+
+# date(1970, 1, 1).toordinal() — lets us turn datetime64[D] into date ordinals
+_EPOCH_ORDINAL = 719163
+
+# Every key uses -1 / b'' for "invalid"; such rows are never indexed and such queries never match
+INVALID = -1
+
+
+def _stripped(series):
+    """Series as stripped strings, with missing values as '' (callers also check notna())."""
+    return series.where(series.notna(), '').astype(str).str.strip()
+
+
+def account_key(series):
+    """Stripped account strings as fixed-width bytes (b'' when missing, too long or non-ASCII)."""
+    accounts = _stripped(series)
+    valid = series.notna() & accounts.str.len().between(1, ACCOUNT_WIDTH) & accounts.map(str.isascii)
+    return accounts.where(valid, '').to_numpy(dtype=f'S{ACCOUNT_WIDTH}')
+
+
+def phone_key(series):
+    """Stripped phone strings as int64 keys (-1 unless they are plain digits without a leading zero)."""
+    phones = _stripped(series)
+    valid = series.notna() & phones.str.fullmatch(_PHONE_RE.pattern)
+    return pd.to_numeric(phones.where(valid, str(INVALID))).astype('int64').to_numpy()
+
+
+def dob_ordinal(series):
+    """DOBs normalized like identity_verify, as date ordinals (-1 when not a real M-D-YYYY date)."""
+    normalized = normalize_dob(_stripped(series))
+    valid = series.notna() & normalized.str.fullmatch(_DOB_RE.pattern)
+    dates = pd.to_datetime(normalized.where(valid), format='%m-%d-%Y', errors='coerce')
+    days = dates.to_numpy(dtype='datetime64[D]')
+    ordinals = days.astype('int64') + _EPOCH_ORDINAL
+    ordinals[np.isnat(days)] = INVALID
+    return ordinals.astype('int32')
+
+
+def _account(value):
+    """Scalar version of account_key() for single lookups."""
+    account = str(value).strip()
+    if not account or len(account) > ACCOUNT_WIDTH or not account.isascii():
+        return b''
+    return account.encode('ascii')
+
+
+def _phone(value):
+    """Scalar version of phone_key() for single lookups."""
+    phone = str(value).strip()
+    return int(phone) if _PHONE_RE.fullmatch(phone) else INVALID
+
+
+def _dob(value):
+    """Scalar version of dob_ordinal() for single lookups (same normalization as identity_verify)."""
+    normalized = str(value).strip().replace('/', '-').lstrip('0').replace('-0', '-')
+    match = _DOB_RE.fullmatch(normalized)
+    if not match:
+        return INVALID
+    month, day, year = (int(part) for part in match.groups())
+    try:
+        return date(year, month, day).toordinal()
+    except ValueError:
+        return INVALID
+
+
+def _pack_strings(values):
+    """Pack strings into one UTF-8 buffer, returning (buffer, offsets, lengths). Missing values pack as ''."""
+    encoded = ['' if pd.isna(v) else str(v).strip() for v in values]
+    encoded = [s.encode('utf-8') for s in encoded]
+    lengths = np.fromiter((len(b) for b in encoded), dtype='int64', count=len(encoded))
+    offsets = np.zeros(len(encoded), dtype='int64')
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    buffer = np.frombuffer(b''.join(encoded), dtype='uint8')
+    return buffer, offsets, lengths
+
+
+class ClientIndex:
+    """Compact, sorted-by-account index over Clients.csv, giving the same verdicts as identity_verify."""
+
+    __slots__ = ('accounts', 'records', 'strings')
+
+    def __init__(self, accounts, records, strings):
+        # Sorted account keys in their own contiguous array so searchsorted never copies a column
+        self.accounts = accounts
+        self.records = records
+        self.strings = strings
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Build the index from a DataFrame with the Clients.csv columns.
+
+        Rows with a missing name or an invalid account, phone or DOB can never be
+        verified, so they are left out instead of sharing an "invalid" key.
+        """
+        accounts = account_key(df['Account number'])
+        phones = phone_key(df['Phone number'])
+        dobs = dob_ordinal(df['Date of birth'])
+        names = _stripped(df['Name'])
+        valid = (accounts != b'') & (phones != INVALID) & (dobs != INVALID) & \
+            (df['Name'].notna() & (names != '')).to_numpy()
+        df = df[valid]
+
+        names, name_off, name_len = _pack_strings(df['Name'])
+        emails, email_off, email_len = _pack_strings(df['Email'])
+        strings = np.concatenate([names, emails])
+        email_off = email_off + len(names)
+
+        if len(strings) > np.iinfo('uint32').max:
+            raise ValueError("Client names and emails are too large for the index string buffer.")
+        # Lengths are uint16; clipping would cut a value (maybe mid-character) instead of failing here
+        if max(name_len.max(initial=0), email_len.max(initial=0)) > np.iinfo('uint16').max:
+            raise ValueError("A client name or email is too long for the index.")
+
+        records = np.empty(len(df), dtype=RECORD_DTYPE)
+        records['phone'] = phones[valid]
+        records['dob'] = dobs[valid]
+        records['name_off'] = name_off
+        records['name_len'] = name_len
+        records['email_off'] = email_off
+        records['email_len'] = email_len
+
+        # Sort by account so lookups are a binary search; records[i] belongs to accounts[i]
+        accounts = accounts[valid]
+        order = np.argsort(accounts, kind='stable')
+        return cls(accounts[order], records[order], strings)
+
+    @classmethod
+    def from_csv(cls, csv_path=CSV_PATH):
+        """Build the index straight from the client CSV, read the same way as load_clients() in bot.py."""
+        return cls.from_dataframe(pd.read_csv(csv_path, encoding='utf-8-sig'))
+
+    def save(self, path=INDEX_PATH):
+        """Write the index as .npy files so it can be memory-mapped later."""
+        np.save(f"{path}.accounts.npy", self.accounts)
+        np.save(f"{path}.records.npy", self.records)
+        np.save(f"{path}.strings.npy", self.strings)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH, mmap=True):
+        """Load a prebuilt index. With mmap=True every worker process shares the same pages."""
+        mode = 'r' if mmap else None
+        # np.asarray drops the np.memmap subclass (same pages, less per-call overhead)
+        accounts = np.asarray(np.load(f"{path}.accounts.npy", mmap_mode=mode))
+        records = np.asarray(np.load(f"{path}.records.npy", mmap_mode=mode))
+        strings = np.asarray(np.load(f"{path}.strings.npy", mmap_mode=mode))
+        if records.dtype != RECORD_DTYPE:
+            raise ValueError(f"{path} was built with an older record layout. Re-run client_index.py.")
+        return cls(accounts, records, strings)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def nbytes(self):
+        return self.accounts.nbytes + self.records.nbytes + self.strings.nbytes
+
+    def _text(self, offset, length):
+        return self.strings[offset:offset + length].tobytes().decode('utf-8')
+
+    def name(self, pos):
+        _, _, name_off, name_len, _, _ = self.records[pos].item()
+        return self._text(name_off, name_len)
+
+    def email(self, pos):
+        """The client's email, or None if the CSV had none."""
+        _, _, _, _, email_off, email_len = self.records[pos].item()
+        return self._text(email_off, email_len) if email_len else None
+
+    def find(self, account):
+        """Return the positions of all records with this account number."""
+        key = _account(account)
+        if not key:
+            return range(0)
+        start = stop = int(np.searchsorted(self.accounts, key))
+        # Duplicate accounts are rare, so walk forward instead of a second binary search
+        while stop < len(self.accounts) and self.accounts[stop] == key:
+            stop += 1
+        return range(start, stop)
+
+    def verify(self, name, account, dob, phone):
+        """Check a (name, account, DOB, phone) tuple. Returns {'Name', 'Email'} or None."""
+        dob_key = _dob(dob)
+        phone_key = _phone(phone)
+        name_input = str(name).strip().lower()
+        if dob_key == INVALID or phone_key == INVALID or not name_input:
+            return None
+
+        for pos in self.find(account):
+            rec_phone, rec_dob, name_off, name_len, email_off, email_len = self.records[pos].item()
+            if rec_dob != dob_key or rec_phone != phone_key:
+                continue
+            user_name = self._text(name_off, name_len)
+            if user_name.lower() == name_input:
+                return {'Name': user_name, 'Email': self._text(email_off, email_len) if email_len else None}
+        return None
+
+
+if __name__ == '__main__':
+    # Usage: python client_index.py [clients.csv] [index path]
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else CSV_PATH
+    index_path = sys.argv[2] if len(sys.argv) > 2 else INDEX_PATH
+    index = ClientIndex.from_csv(csv_path)
+    index.save(index_path)
+    print(f"Indexed {len(index)} clients ({index.nbytes} bytes) -> {index_path}.*.npy")
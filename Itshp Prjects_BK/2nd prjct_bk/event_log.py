@@ -0,0 +1,156 @@
+import atexit
+import glob
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+import pandas as pd
+
+# Where conversation events are written (one gzip-compressed JSONL file per hour and process)
+LOG_DIR = os.getenv('EVENT_LOG_DIR', os.path.join(os.path.dirname(__file__), 'logs'))
+
+# Steps of the PIN reset flow, in order, for the funnel report
+# (verify_email is left out: only users who pick email OTP go through it)
+PIN_FUNNEL = ['identity_verify', 'otp_method', 'verify_otp', 'new_pin', 'confirm_pin']
+
+
+class EventLog:
+    """Append-only event log. emit() only appends to a buffer; a background thread does the disk I/O."""
+
+    def __init__(self, log_dir=LOG_DIR, flush_interval=2.0, batch_size=500, max_buffer=100_000):
+        self.log_dir = log_dir
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.dropped = 0
+        self._dropped_reported = 0
+
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='event-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def emit(self, event):
+        """Queue one event (a JSON-serializable dict). Never blocks on disk."""
+        event.setdefault('ts', time.time())
+        with self._lock:
+            # If the disk can't keep up, drop events rather than growing memory forever
+            if len(self._buffer) >= self.max_buffer:
+                self.dropped += 1
+                return
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write everything buffered so far to the current hourly file."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            dropped, self._dropped_reported = self.dropped - self._dropped_reported, self.dropped
+        if dropped:
+            print(f"Event log buffer full: dropped {dropped} events ({self.dropped} since start)")
+        if not batch:
+            return
+
+        # Group by hour so each event lands in the file for the hour it happened in
+        files = {}
+        for event in batch:
+            hour = time.strftime('%Y%m%d-%H', time.localtime(event['ts']))
+            files.setdefault(hour, []).append(json.dumps(event, separators=(',', ':')))
+
+        with self._write_lock:
+            try:
+                os.makedirs(self.log_dir, exist_ok=True)
+                for hour, lines in files.items():
+                    # Appending a new gzip member per batch keeps the file a valid .gz. Each process
+                    # (e.g. gunicorn workers) gets its own file so members never interleave.
+                    path = os.path.join(self.log_dir, f"events-{hour}-{os.getpid()}.jsonl.gz")
+                    with gzip.open(path, 'at', encoding='utf-8') as f:
+                        f.write('\n'.join(lines) + '\n')
+            except OSError as e:
+                print(f"Error writing event log: {e}")
+
+    def close(self):
+        """Stop the writer thread and flush what's left."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+
+def read_events(path):
+    """Yield the events in one log file.
+
+    A file still being written, or cut short by a crash, can end in a truncated gzip
+    member; everything before it is kept and the partial tail is skipped.
+    """
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    except (EOFError, OSError, zlib.error) as e:
+        print(f"Skipping truncated end of {path}: {e}")
+
+
+def load_events(log_dir=LOG_DIR):
+    """Read every event file in log_dir into a DataFrame (one row per event)."""
+    events = [event
+              for path in sorted(glob.glob(os.path.join(log_dir, 'events-*.jsonl.gz')))
+              for event in read_events(path)]
+    return pd.DataFrame(events)
+
+
+def funnel_report(events):
+    """Number of sessions reaching each PIN reset step, plus how many completed it."""
+    reached = events.groupby('step_to')['sid'].nunique()
+    rows = [(step, int(reached.get(step, 0))) for step in PIN_FUNNEL]
+
+    # A reset is complete when confirm_pin moves the user on to general_query
+    done = events[(events['step_from'] == 'confirm_pin') & (events['step_to'] == 'general_query')]
+    rows.append(('pin_reset_done', done['sid'].nunique()))
+
+    report = pd.DataFrame(rows, columns=['step', 'sessions'])
+    first = report['sessions'].iloc[0]
+    report['% of start'] = (100 * report['sessions'] / first).round(1) if first else 0.0
+    report['drop-off'] = (-report['sessions'].diff()).fillna(0).astype(int)
+    return report
+
+
+def latency_report(events):
+    """Latency percentiles (ms) per stage: the whole turn plus each timed stage."""
+    stages = pd.json_normalize(events['latency_ms'].tolist())
+    report = stages.describe(percentiles=[0.5, 0.95, 0.99]).T
+    return report[['count', 'mean', '50%', '95%', '99%', 'max']].round(1)
+
+
+if __name__ == '__main__':
+    # Usage: python event_log.py [log dir]
+    events = load_events(sys.argv[1] if len(sys.argv) > 1 else LOG_DIR)
+    if events.empty:
+        print("No events found.")
+        sys.exit(0)
+
+    print(f"{len(events)} turns from {events['sid'].nunique()} sessions\n")
+    print("PIN reset funnel:")
+    print(funnel_report(events).to_string(index=False))
+    print("\nLatency by stage (ms):")
+    print(latency_report(events).to_string())
+    if 'cache_hit' in events:
+        print(f"\nCache hit rate: {100 * events['cache_hit'].mean():.1f}%")
@@ -0,0 +1,17 @@
+"""Identity-check rules shared by the chat flow (bot.py), bulk_verify.py and client_index.py."""
+
+
+def normalize_dob(series):
+    """Vectorized DOB normalization used by identity_verify: 09/02/1993, 9-2-1993 -> 9-2-1993."""
+    return series.astype(str).str.strip().str.replace('/', '-').str.lstrip('0').str.replace('-0', '-')
+
+
+def find_client(df, name, account, dob, phone):
+    """The identity_verify check in bot.py: rows of the client DataFrame matching all four details."""
+    return df[
+        (df['Name'].astype(str).str.strip().str.lower() == name.strip().lower()) &
+        (df['Account number'].astype(str).str.strip() == account.strip()) &
+        (normalize_dob(df['Date of birth']) ==
+         dob.strip().replace('/', '-').lstrip('0').replace('-0', '-')) &
+        (df['Phone number'].astype(str).str.strip() == phone.strip())
+    ]
@@ -0,0 +1,175 @@
+import math
+import os
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from itertools import repeat
+import pandas as pd
+
+# Path to FAQ data CSV — its Language column gives us labelled text for every language
+FAQ_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'faq_data_all1.csv')
+
+# The FAQ only has two Kinyarwanda rows, so every language also gets a few typical customer messages.
+# They must not repeat FAQ questions or bot replies, or the benchmark below would flatter itself.
+SEED_TEXT = {
+    'English': [
+        "Hello, I forgot my PIN and need help with my account.",
+        "How can I send money to my phone? Thank you.",
+    ],
+    'French': [
+        "Bonjour, j'ai oublié mon code PIN et j'ai besoin d'aide avec mon compte.",
+        "Comment envoyer de l'argent vers mon téléphone ? Merci.",
+    ],
+    'Kinyarwanda': [
+        "Mwiriwe, nibagiwe umubare w'ibanga wanjye, nabigenza nte?",
+        "Ni gute nohereza amafaranga kuri telefoni yanjye?",
+        "Ikarita yanjye ntikora, mwamfasha? Murakoze cyane.",
+        "Ndashaka kumenya amafaranga asigaye kuri konti yanjye.",
+        "Ese ishami ryanyu rifungura saa ngahe mu gitondo?",
+        "Nabuze telefoni yanjye ejo, none sinshobora kwinjira.",
+    ],
+}
+
+# Kinyarwanda messages used only by the benchmark: the FAQ has too few Kinyarwanda questions to
+# measure anything, and none of these appear in the FAQ or in SEED_TEXT
+HELDOUT_KINYARWANDA = [
+    "Byiza! Nyamuneka sobanura ikibazo cyawe kandi nzakushakira igisubizo.",
+    "Ushobora guhamagara serivisi y'abakiriya ya Banki ya Kigali.",
+    "Konti yanjye yafunzwe, nakora iki?",
+    "Ni he nakura inguzanyo yo kubaka inzu?",
+    "Murakoze, mugire umunsi mwiza.",
+    "Amafaranga nohereje ejo ntaragera ku wo nayoherereje.",
+    "Ndashaka guhindura nimero ya telefoni iri kuri konti.",
+    "Mbese nshobora kubikuza amafaranga hanze y'igihugu?",
+]
+
+NGRAM_SIZES = (1, 2, 3)
+
+# Below these we don't trust the guess and the caller's default is used instead
+MIN_LETTERS = 4
+MIN_MARGIN = 0.05
+
+# The language of a message is clear well before this many characters
+MAX_CHARS = 200
+
+
+def _normalize(text):
+    """Lowercase, keep letters (with accents) and apostrophes, collapse everything else to spaces."""
+    text = unicodedata.normalize('NFC', str(text)).casefold().replace('’', "'")
+    return ' '.join(re.sub(r"[^\w']|[\d_]", ' ', text).split())
+
+
+def _ngrams(text):
+    padded = f" {text} "
+    for n in NGRAM_SIZES:
+        for i in range(len(padded) - n + 1):
+            yield padded[i:i + n]
+
+
+def build_profiles(texts_by_language):
+    """Turn {language: [texts]} into one {ngram: log P} table per language plus unseen-ngram fallbacks."""
+    counts = {language: Counter() for language in texts_by_language}
+    for language, texts in texts_by_language.items():
+        for text in texts:
+            counts[language].update(_ngrams(_normalize(text)))
+
+    vocabulary = set().union(*counts.values())
+    languages = tuple(counts)
+    # Add-one smoothing so an unseen n-gram costs something instead of ruling a language out
+    denominators = [sum(counts[language].values()) + len(vocabulary) for language in languages]
+    tables = tuple(
+        {gram: math.log((counts[language][gram] + 1) / d) for gram in vocabulary}
+        for language, d in zip(languages, denominators)
+    )
+    unseen = tuple(math.log(1 / d) for d in denominators)
+    return languages, tables, unseen
+
+
+def load_training_texts(faq_path=FAQ_CSV_PATH, columns=('Question', 'Answer')):
+    """Collect FAQ text per language, plus the seed sentences."""
+    faq_df = pd.read_csv(faq_path, encoding='utf-8-sig')
+    texts = {language: list(seeds) for language, seeds in SEED_TEXT.items()}
+    for _, row in faq_df.iterrows():
+        language = str(row['Language']).strip()
+        texts.setdefault(language, []).extend(str(row[column]) for column in columns)
+    return texts
+
+
+# Built once at import; scoring is one dict lookup per n-gram and language
+_PROFILES = build_profiles(load_training_texts())
+
+
+def score(text, profiles=None):
+    """Return ({language: average log-probability per n-gram}, letter count)."""
+    languages, tables, unseen = profiles or _PROFILES
+    text = _normalize(text[:MAX_CHARS])
+    grams = list(_ngrams(text))
+    letters = sum(ch.isalpha() for ch in text)
+    # map(dict.get, ...) keeps the per-n-gram loop in C
+    return {
+        language: sum(map(table.get, grams, repeat(missing))) / max(len(grams), 1)
+        for language, table, missing in zip(languages, tables, unseen)
+    }, letters
+
+
+def classify(text, profiles=None):
+    """Uncached detection: the most likely language, or None if the text is too short or ambiguous."""
+    scores, letters = score(text, profiles)
+    if letters < MIN_LETTERS:
+        return None
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    if scores[ranked[0]] - scores[ranked[1]] < MIN_MARGIN:
+        return None
+    return ranked[0]
+
+
+@lru_cache(maxsize=4096)
+def _detect_cached(text):
+    return classify(text)
+
+
+def detect_language(text, default=None):
+    """Detect English, French or Kinyarwanda. Returns default when the guess isn't confident."""
+    return _detect_cached(text.strip()) or default
+
+
+if __name__ == '__main__':
+    # Benchmark: profiles from FAQ answers + seeds, evaluated on the (held-out) FAQ questions
+    faq_path = sys.argv[1] if len(sys.argv) > 1 else FAQ_CSV_PATH
+    profiles = build_profiles(load_training_texts(faq_path, columns=('Answer',)))
+    faq_df = pd.read_csv(faq_path, encoding='utf-8-sig')
+    questions = faq_df['Question'].astype(str).tolist()
+    expected = faq_df['Language'].str.strip().tolist()
+
+    predicted = [classify(q, profiles) for q in questions]
+    results = pd.DataFrame({'Language': expected, 'correct': [p == e for p, e in zip(predicted, expected)],
+                            'undecided': [p is None for p in predicted]})
+    print("Accuracy on FAQ questions (profiles built from answers only):")
+    print(results.groupby('Language')[['correct', 'undecided']].agg(['sum', 'count']).to_string())
+    print(f"Overall: {100 * results['correct'].mean():.1f}% correct, {results['undecided'].sum()} undecided\n")
+
+    heldout = [classify(text, profiles) for text in HELDOUT_KINYARWANDA]
+    print(f"Held-out Kinyarwanda messages: {heldout.count('Kinyarwanda')}/{len(heldout)} correct, "
+          f"{heldout.count(None)} undecided\n")
+
+    rounds = 200
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for q in questions:
+            classify(q, profiles)
+    elapsed = time.perf_counter() - start
+    n = rounds * len(questions)
+    print(f"Throughput (uncached): {n / elapsed:,.0f} messages/s, {elapsed / n * 1e6:.1f} us per message")
+
+    _detect_cached.cache_clear()
+    for q in questions:
+        detect_language(q)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for q in questions:
+            detect_language(q)
+    elapsed = time.perf_counter() - start
+    print(f"Throughput (cached):   {n / elapsed:,.0f} messages/s, {elapsed / n * 1e6:.2f} us per message")
@@ -0,0 +1,63 @@
+import pandas as pd
+from identity import find_client
+from bulk_verify import CSV_PATH, load_client_keys, parse_ndjson, verify_records
+
+PAULA = {'name': 'Paula', 'account': '040-2398210-39', 'dob': '09-22-1993', 'phone': '250793229902'}
+
+
+def test_matches_identity_verify():
+    clients = pd.read_csv(CSV_PATH, encoding='utf-8-sig')
+    records = [
+        PAULA,
+        dict(PAULA, name=' PAULA ', dob='9/22/1993'),
+        dict(PAULA, account='40239821039'),
+        dict(PAULA, phone='+250 793 229 902'),
+        dict(PAULA, name='Paul'),
+    ]
+    results = list(verify_records(records))
+    for record, result in zip(records, results):
+        assert result['verified'] == (not find_client(clients, **record).empty)
+
+
+def test_result_does_not_depend_on_other_records_in_chunk():
+    alone = list(verify_records([dict(PAULA, id=1, phone=250793229902)]))
+    mixed = list(verify_records([dict(PAULA, id=1, phone=250793229902), dict(PAULA, id=2, phone=None)]))
+    assert alone[0]['verified'] is True
+    assert mixed[0]['verified'] is True
+    assert mixed[1] == {'index': 1, 'id': 2, 'verified': False, 'error': 'missing fields'}
+
+
+def test_position_is_separate_from_caller_ids():
+    results = list(verify_records([dict(PAULA, id=1), {}]))
+    assert results == [
+        {'index': 0, 'id': 1, 'verified': True},
+        {'index': 1, 'verified': False, 'error': 'missing fields'},
+    ]
+
+
+def test_invalid_ndjson_lines_are_reported_not_fatal():
+    lines = [b'{"id": "a", "name": "Paula", "account": "040-2398210-39", "dob": "9-22-1993", "phone": "250793229902"}\n',
+             b'not json\n', b'\n', b'\xff\xfe\n']
+    results = list(verify_records(parse_ndjson(lines), load_client_keys()))
+    assert [r['verified'] for r in results] == [True, False, False]
+    assert results[2]['error'] == 'missing fields'
+
+
+def test_blank_fields_never_verify(tmp_path):
+    csv_path = tmp_path / 'Clients.csv'
+    csv_path.write_text(
+        "Name,Account number,Date of birth,Phone number,PIN,OTP,Email\n"
+        "Ghost,,,,1111,22222,\n"
+        "Paula,040-2398210-39,09-22-1993,250793229902,3924,92340,paula@gmail.com\n",
+        encoding='utf-8',
+    )
+    client_keys = load_client_keys(str(csv_path))
+    assert len(client_keys) == 1
+
+    records = [{'name': 'ghost', 'account': '', 'dob': '', 'phone': ''},
+               dict(PAULA, phone='  ')]
+    results = list(verify_records(records, client_keys))
+    assert results == [
+        {'index': 0, 'verified': False, 'error': 'missing fields'},
+        {'index': 1, 'verified': False, 'error': 'missing fields'},
+    ]
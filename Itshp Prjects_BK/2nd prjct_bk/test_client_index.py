@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+from identity import find_client
+from client_index import CSV_PATH, ClientIndex
+
+# (name, account, DOB, phone) as a user might type them into the identity_verify step
+CASES = [
+    ('Paula', '040-2398210-39', '09-22-1993', '250793229902'),
+    (' paula ', '040-2398210-39 ', '9/22/1993', ' 250793229902'),
+    ('Jonathan', '040-2944783-33', '2-29-2004', '250732019345'),
+    ('Stacy', '040-5330294-43', '12-1-2000', '250787903234'),
+    ('Paula', '40239821039', '09-22-1993', '250793229902'),
+    ('Paula', '040239821039', '09-22-1993', '250793229902'),
+    ('Paula', '040-2398210-39', '09-22-1993', '+250 793 229 902'),
+    ('Paula', '040-2398210-39', '09-22-1993', '0250793229902'),
+    ('Paula', '040-2398210-39', '9-22-93', '250793229902'),
+    ('Paula', '040-2398210-39', '22-09-1993', '250793229902'),
+    ('Paula', '040-2398210-39', '09-002-1993', '250793229902'),
+    ('Paul', '040-2398210-39', '09-22-1993', '250793229902'),
+    ('Paula', '040-3294193-10', '09-22-1993', '250793229902'),
+    ('ghost', 'n/a', '??', 'none'),
+    ('', '', '', ''),
+]
+
+
+@pytest.fixture(scope='module')
+def clients():
+    # Read exactly like load_clients() in bot.py
+    return pd.read_csv(CSV_PATH, encoding='utf-8-sig')
+
+
+@pytest.mark.parametrize('name,account,dob,phone', CASES)
+def test_index_agrees_with_identity_verify(clients, name, account, dob, phone):
+    index = ClientIndex.from_dataframe(clients)
+    expected = not find_client(clients, name, account, dob, phone).empty
+    assert (index.verify(name, account, dob, phone) is not None) == expected
+
+
+def test_index_round_trips_through_mmap(clients, tmp_path):
+    ClientIndex.from_dataframe(clients).save(str(tmp_path / 'Clients.idx'))
+    index = ClientIndex.load(str(tmp_path / 'Clients.idx'))
+    assert index.verify('Mugisha', '040-4921838-23', '11/10/2001', '250788234446') == \
+        {'Name': 'Mugisha', 'Email': 'mugisha@gmail.com'}
+
+
+def test_rows_with_invalid_keys_are_never_indexed(tmp_path):
+    csv_path = tmp_path / 'Clients.csv'
+    csv_path.write_text(
+        "Name,Account number,Date of birth,Phone number,PIN,OTP,Email\n"
+        "Ghost,,not a date,,1111,22222,ghost@gmail.com\n"
+        "Paula,040-2398210-39,09-22-1993,250793229902,3924,92340,\n",
+        encoding='utf-8',
+    )
+    index = ClientIndex.from_dataframe(pd.read_csv(csv_path, dtype=str))
+    assert len(index) == 1
+    assert index.verify('ghost', 'n/a', '??', 'none') is None
+    assert index.verify('ghost', '', '', '') is None
+    # A missing email is None, not the string 'nan'
+    assert index.verify('Paula', '040-2398210-39', '09-22-1993', '250793229902') == \
+        {'Name': 'Paula', 'Email': None}
+
+
+def test_oversized_names_are_rejected_not_truncated(clients):
+    clients = clients.copy()
+    clients.loc[0, 'Name'] = 'é' * 40_000   # 80,000 UTF-8 bytes, more than a uint16 length holds
+    with pytest.raises(ValueError):
+        ClientIndex.from_dataframe(clients)
@@ -0,0 +1,104 @@
+import gzip
+import json
+import os
+import pandas as pd
+from event_log import EventLog, funnel_report, latency_report, load_events
+
+
+def test_each_process_writes_its_own_file(tmp_path):
+    log = EventLog(str(tmp_path), flush_interval=60)
+    log.emit({'sid': 'a', 'step_from': 'menu', 'step_to': 'faq_complaint', 'ts': 0})
+    log.close()
+    assert [p.name.endswith(f"-{os.getpid()}.jsonl.gz") for p in tmp_path.iterdir()] == [True]
+
+
+def test_truncated_trailing_member_is_skipped(tmp_path):
+    path = tmp_path / 'events-20260101-00-1.jsonl.gz'
+    with gzip.open(path, 'at', encoding='utf-8') as f:
+        f.write('{"sid":"a","step_to":"identity_verify"}\n')
+    # A second member cut off mid-write, as after a crash
+    member = gzip.compress(b'{"sid":"b","step_to":"otp_method"}\n{"sid":"c","step_to":"new_pin"}\n')
+    with open(path, 'ab') as f:
+        f.write(member[:len(member) // 2])
+
+    events = load_events(str(tmp_path))
+    assert events['sid'].tolist() == ['a']
+
+
+def test_dropped_events_are_reported_on_flush(tmp_path, capsys):
+    log = EventLog(str(tmp_path), flush_interval=60, max_buffer=1)
+    for step in ('menu', 'faq_complaint', 'general_query'):
+        log.emit({'sid': 'a', 'step_to': step, 'ts': 0})
+    log.close()
+    assert log.dropped == 2
+    assert "dropped 2 events" in capsys.readouterr().out
+
+
+def make_events(rows):
+    return pd.DataFrame(rows, columns=['sid', 'step_from', 'step_to', 'latency_ms'])
+
+
+def test_funnel_report_counts_sessions_per_step():
+    events = make_events([
+        ('a', 'menu', 'identity_verify', {'total': 1}),
+        ('a', 'identity_verify', 'identity_verify', {'total': 1}),
+        ('a', 'identity_verify', 'otp_method', {'total': 1}),
+        ('a', 'otp_method', 'verify_otp', {'total': 1}),
+        ('a', 'verify_otp', 'new_pin', {'total': 1}),
+        ('a', 'new_pin', 'confirm_pin', {'total': 1}),
+        ('a', 'confirm_pin', 'general_query', {'total': 1}),
+        ('b', 'menu', 'identity_verify', {'total': 1}),
+        ('b', 'identity_verify', 'otp_method', {'total': 1}),
+        # A wrong confirmation sends the user back to new_pin: not a completed reset
+        ('c', 'menu', 'identity_verify', {'total': 1}),
+        ('c', 'new_pin', 'confirm_pin', {'total': 1}),
+        ('c', 'confirm_pin', 'new_pin', {'total': 1}),
+    ])
+    report = funnel_report(events).set_index('step')
+    assert report['sessions'].to_dict() == {
+        'identity_verify': 3, 'otp_method': 2, 'verify_otp': 1, 'new_pin': 2, 'confirm_pin': 2,
+        'pin_reset_done': 1,
+    }
+    assert report.loc['otp_method', '% of start'] == 66.7
+    assert report.loc['otp_method', 'drop-off'] == 1
+
+
+def test_funnel_report_without_pin_resets_does_not_divide_by_zero():
+    events = make_events([('a', 'menu', 'general_query', {'total': 5})])
+    report = funnel_report(events)
+    assert report['sessions'].sum() == 0
+    assert (report['% of start'] == 0).all()
+
+
+def test_latency_report_has_percentiles_per_stage():
+    events = make_events([('a', 'menu', 'general_query', {'total': float(ms), 'gemini': float(ms) - 1})
+                          for ms in range(1, 101)])
+    report = latency_report(events)
+    assert list(report.index) == ['total', 'gemini']
+    assert report.loc['total', 'count'] == 100
+    assert report.loc['total', '50%'] == 50.5
+    assert report.loc['total', 'max'] == 100
+
+
+class RecordingLog:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+def test_chat_turns_never_log_personal_data(monkeypatch):
+    import bot
+    log = RecordingLog()
+    monkeypatch.setattr(bot, 'event_log', log)
+    client = bot.app.test_client()
+    details = ['Paula', '040-2398210-39', '09-22-1993', '250793229902', '1', '92340', '4821', '4821']
+    for message in ['1'] + details:
+        client.post('/chat', json={'message': message})
+
+    assert [event['step_to'] for event in log.events][-4:] == ['verify_otp', 'new_pin', 'confirm_pin', 'general_query']
+    logged = json.dumps(log.events)
+    for value in details[:4] + details[5:]:
+        assert value not in logged
+    assert 'paula' not in logged.lower()
@@ -0,0 +1,73 @@
+import pytest
+import bot
+from lang_detect import build_profiles, classify, detect_language
+
+
+@pytest.mark.parametrize('text,language', [
+    ("I lost my card", 'English'),
+    ("Where is the nearest branch?", 'English'),
+    ("J'ai perdu ma carte", 'French'),
+    ("Où est l'agence la plus proche ?", 'French'),
+    ("Nabuze ikarita yanjye", 'Kinyarwanda'),
+    ("Ishami rya hafi riri he?", 'Kinyarwanda'),
+])
+def test_classify_short_messages(text, language):
+    assert classify(text) == language
+
+
+@pytest.mark.parametrize('text', ['ok', 'hi', '123456', '  '])
+def test_too_short_to_tell(text):
+    assert classify(text) is None
+    assert detect_language(text, default='French') == 'French'
+
+
+def test_ambiguous_text_is_undecided():
+    # Two languages with identical profiles can never be told apart
+    profiles = build_profiles({'A': ['banki konti'], 'B': ['banki konti']})
+    assert classify('banki konti yanjye', profiles) is None
+
+
+class NullLog:
+    def emit(self, event):
+        pass
+
+
+@pytest.fixture
+def chat(monkeypatch):
+    """Flask test client in the faq_complaint step, with FAQ matching recorded instead of called."""
+    calls = []
+
+    def match_faq(text, language):
+        calls.append((text, language))
+        return None
+
+    monkeypatch.setattr(bot, 'match_faq', match_faq)
+    monkeypatch.setattr(bot, 'event_log', NullLog())
+    client = bot.app.test_client()
+    with client.session_transaction() as session:
+        session['step'] = 'faq_complaint'
+    client.calls = calls
+    return client
+
+
+def test_typing_a_language_name_switches_language(chat):
+    reply = chat.post('/chat', json={'message': 'Français'}).json
+    assert reply['messages'][-1]['text'] == bot.FAQ_PROMPTS['French']
+    assert reply['step'] == 'faq_complaint'
+    assert chat.calls == []
+    with chat.session_transaction() as session:
+        assert session['language'] == 'French'
+
+
+def test_menu_numbers_are_not_language_switches(chat):
+    chat.post('/chat', json={'message': '3'})
+    assert chat.calls == [('3', 'English')]
+
+
+def test_sessions_with_legacy_faq_language_keep_it(chat):
+    with chat.session_transaction() as session:
+        session['faq_language'] = 'Kinyarwanda'
+    chat.post('/chat', json={'message': 'ok'})
+    assert chat.calls == [('ok', 'Kinyarwanda')]
+    with chat.session_transaction() as session:
+        assert session['language'] == 'Kinyarwanda'
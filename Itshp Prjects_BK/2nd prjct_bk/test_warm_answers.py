@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+import assistant
+from answer_bank import AnswerBank, faq_version
+from warm_answers import StubClient, StubModels, warm_up
+
+
+@pytest.fixture(autouse=True)
+def stub_client(monkeypatch):
+    monkeypatch.setattr(assistant, '_client', StubClient())
+
+
+@pytest.fixture(scope='module')
+def faq_df():
+    return pd.read_csv(assistant.FAQ_CSV_PATH, encoding='utf-8-sig')
+
+
+def test_warm_up_keeps_faq_and_general_answers_apart(faq_df):
+    questions = pd.DataFrame({
+        'Question': ['How do I open a new account with BK?', 'Tell me about football scores'],
+        'Language': ['english', 'English'],
+    })
+    answers, summary, failures = warm_up(faq_df, questions, workers=2)
+
+    assert failures == []
+    assert summary['questions'] == 2
+    # 'english' is stored under the FAQ's spelling, so bot.py's lookups find it
+    assert set(answers['faq']) == set(faq_df['Language'].str.strip())
+    assert 'english' not in answers['general']
+    assert 'how do i open a new account with bk' in answers['faq']['English']
+    assert 'tell me about football scores' in answers['general']['English']
+    assert 'tell me about football scores' not in answers['faq']['English']
+
+
+def test_warm_up_rejects_unknown_languages(faq_df):
+    questions = pd.DataFrame({'Question': ['Wie eröffne ich ein Konto?'], 'Language': ['German']})
+    answers, summary, failures = warm_up(faq_df, questions, workers=1)
+
+    assert summary['questions'] == 0
+    assert [language for language, _, _ in failures] == ['German']
+    assert 'German' not in answers['faq'] and 'German' not in answers['general']
+
+
+def test_warm_up_bank_round_trips(faq_df, tmp_path):
+    questions = pd.DataFrame({'Question': ['Tell me about football scores'], 'Language': ['English']})
+    answers, _, _ = warm_up(faq_df, questions, workers=1)
+    path = str(tmp_path / 'answer_bank.json')
+    AnswerBank(answers['faq'], answers['general'], faq_version(assistant.FAQ_CSV_PATH)).save(path)
+
+    bank = AnswerBank.load(path, faq_path=assistant.FAQ_CSV_PATH)
+    assert bank.get_faq('How can I open a new account?', 'English')
+    # General answers are served by the Q&A mode but never by the FAQ flow
+    assert bank.get('tell me about football scores!', 'English')
+    assert bank.get_faq('Tell me about football scores', 'English') is None
+
+
+class FailingFaqModels(StubModels):
+    """FAQ matching fails with a server error; web answers still work."""
+
+    def generate_content(self, model, contents, config=None):
+        if 'CUSTOMER MESSAGE' in contents:
+            raise RuntimeError("503 UNAVAILABLE")
+        return super().generate_content(model, contents, config)
+
+
+def test_failed_faq_match_is_a_failure_not_a_general_answer(faq_df, monkeypatch):
+    client = StubClient()
+    client.models = FailingFaqModels()
+    monkeypatch.setattr(assistant, '_client', client)
+    questions = pd.DataFrame({'Question': ['How do I open a new account with BK?'], 'Language': ['English']})
+    answers, summary, failures = warm_up(faq_df, questions, workers=1)
+
+    assert summary['failed'] == 1
+    assert failures[0][2] == '503 UNAVAILABLE'
+    assert answers['general'] == {}
+
+
+def test_missing_google_genai_is_a_clear_error(monkeypatch):
+    monkeypatch.setattr(assistant, '_client', None)
+    monkeypatch.setattr(assistant, 'genai', None)
+    with pytest.raises(RuntimeError, match='google-genai'):
+        assistant.match_faq('How can I open a new account?', 'English')
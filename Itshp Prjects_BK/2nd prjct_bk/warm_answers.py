@@ -0,0 +1,145 @@
+"""Nightly job: precompute the answer bank that bot.py serves before calling Gemini.
+
+Every FAQ question is stored with its own answer. Optional historical questions
+(a CSV with a Question column and, optionally, Language — detected when missing)
+are sent through the same FAQ matching as the chat, on a bounded worker pool.
+FAQ-matched answers go to the bank's FAQ section; questions no FAQ covers get a
+Gemini answer in the general section, which the FAQ flow never serves.
+
+Usage:
+    python warm_answers.py [--questions top_questions.csv] [--workers 4] [--stub]
+"""
+import argparse
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+import assistant
+from answer_bank import ANSWER_BANK_PATH, AnswerBank, faq_version, normalize_question
+from lang_detect import detect_language
+
+
+class StubModels:
+    """Offline stand-in for client.models: matches FAQs by word overlap, never calls the API."""
+
+    def generate_content(self, model, contents, config=None):
+        class Response:
+            text = ''
+
+        response = Response()
+        message = re.search(r'CUSTOMER MESSAGE \([^)]*\): "(.*)"', contents)
+        if message:
+            # FAQ matching prompt: pick the FAQ sharing the most words with the message
+            words = set(normalize_question(message.group(1)).split())
+            best, best_score = None, 1
+            for idx, question in re.findall(r'^\[(\d+)\] .*? \| Q: (.*)$', contents, re.MULTILINE):
+                score = len(words & set(normalize_question(question).split()))
+                if score > best_score:
+                    best, best_score = idx, score
+            response.text = f"[{best}]" if best else "NO_MATCH"
+        else:
+            question = re.search(r'USER QUESTION: (.*)', contents)
+            response.text = f"(stub answer) {question.group(1) if question else ''}".strip()
+        return response
+
+
+class StubClient:
+    def __init__(self):
+        self.models = StubModels()
+
+
+def answer_question(question, language):
+    """Answer one question the way the chat would. Returns ('faq' or 'general', answer).
+
+    A failed FAQ match raises instead of falling through to a web answer, so it is
+    reported as a failure rather than cached as a general answer.
+    """
+    answer = assistant.match_faq(question, language, raise_errors=True)
+    if answer:
+        return 'faq', answer
+    answer = assistant.ask_gemini_about_bk(question, language=language)
+    if answer.startswith('Error:') or answer == assistant.RATE_LIMIT_REPLY:
+        raise RuntimeError(answer.splitlines()[0])
+    return 'general', answer
+
+
+def warm_up(faq_df, questions_df=None, workers=4, progress_every=50):
+    """Build the answers ({'faq'|'general': {language: {normalized question: answer}}}) and a run summary."""
+    answers = {'faq': {}, 'general': {}}
+    for _, row in faq_df.iterrows():
+        language = row['Language'].strip()
+        answers['faq'].setdefault(language, {})[normalize_question(row['Question'])] = \
+            f"{row['Category']}\n\n{row['Answer']}"
+
+    # Languages are stored under the FAQ's own spelling ('english' -> 'English'), as bot.py looks them up
+    canonical = {language.casefold(): language for language in answers['faq']}
+
+    # Only historical questions the FAQ doesn't already cover need the model
+    jobs = {}
+    failures = []
+    if questions_df is not None:
+        for _, row in questions_df.iterrows():
+            raw_language = str(row['Language']).strip()
+            language = canonical.get(raw_language.casefold())
+            if language is None:
+                failures.append((raw_language, row['Question'], f"unknown language {raw_language!r}"))
+                continue
+            key = normalize_question(row['Question'])
+            if key and key not in answers['faq'][language]:
+                jobs[(language, key)] = row['Question']
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(answer_question, question, language): (language, key, question)
+                   for (language, key), question in jobs.items()}
+        for done, future in enumerate(as_completed(futures), start=1):
+            language, key, question = futures[future]
+            try:
+                section, answer = future.result()
+                answers[section].setdefault(language, {})[key] = answer
+            except Exception as e:
+                failures.append((language, question, str(e)))
+
+            if done % progress_every == 0 or done == len(futures):
+                elapsed = time.perf_counter() - started
+                print(f"[{done}/{len(futures)}] {done / elapsed:.1f} questions/s, {len(failures)} failed")
+
+    summary = {
+        'faq_answers': len(faq_df),
+        'questions': len(jobs),
+        'failed': len(failures),
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+    return answers, summary, failures
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Precompute the BK chatbot answer bank.")
+    parser.add_argument('--faq', default=assistant.FAQ_CSV_PATH, help="FAQ CSV (default: faq_data_all1.csv)")
+    parser.add_argument('--questions', help="CSV of top historical questions (Question, optional Language column)")
+    parser.add_argument('--out', default=ANSWER_BANK_PATH, help="Where to write the answer bank")
+    parser.add_argument('--workers', type=int, default=4, help="Maximum concurrent model calls")
+    parser.add_argument('--stub', action='store_true', help="Use an offline stub model instead of Gemini")
+    args = parser.parse_args()
+
+    if args.stub:
+        assistant.set_client(StubClient())
+    assistant.FAQ_CSV_PATH = args.faq
+
+    faq_df = pd.read_csv(args.faq, encoding='utf-8-sig')
+    questions_df = pd.read_csv(args.questions, encoding='utf-8-sig') if args.questions else None
+    if questions_df is not None:
+        if 'Question' not in questions_df.columns:
+            sys.exit("The questions CSV needs a Question column.")
+        if 'Language' not in questions_df.columns:
+            questions_df['Language'] = [detect_language(str(q), default='English') for q in questions_df['Question']]
+
+    answers, summary, failures = warm_up(faq_df, questions_df, workers=args.workers)
+    AnswerBank(answers['faq'], answers['general'], faq_version(args.faq)).save(args.out)
+
+    for language, question, error in failures:
+        print(f"FAILED ({language}) {question!r}: {error}")
+    print(f"Answer bank written to {args.out}: {summary}")
+    # Non-zero exit lets the nightly scheduler flag partial runs (the bank is still written)
+    sys.exit(1 if failures else 0)